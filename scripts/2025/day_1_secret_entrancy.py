@@ -1,7 +1,22 @@
 import argparse
+import mmap
+import os
+import sys
 from collections.abc import Iterable, Generator
-from itertools import accumulate
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial, reduce
+from itertools import accumulate, islice
 from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+_NEWLINE = ord("\n")
+_ZERO = ord("0")
+_POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+_IS_SPACE = np.zeros(256, dtype=bool)
+_IS_SPACE[list(b" \t\r\v\f")] = True
 
 
 def turn_dial(start: int, rotation: int, dial_size: int=100) -> int:
@@ -25,7 +40,99 @@ def turn_dial(start: int, rotation: int, dial_size: int=100) -> int:
 def count_zero_landings(rotations: Iterable[int]) -> int:
     """Count the number of times the dial lands on position 0 during a series of rotations."""
     positions = apply_rotations(rotations)
-    return list(positions).count(0)
+    return sum(position == 0 for position in positions)
+
+
+# Part 2
+def count_zero_crossings(
+        rotations: Iterable[int], dial_size: int=100, start: int=50, batch_size: int=1_000_000
+    ) -> int:
+    """Count the number of times the dial points at position 0, including mid-rotation clicks.
+
+    Rotations are processed in batches of ``batch_size``. Within a batch the unwrapped
+    dial positions come from a cumulative sum, and the number of multiples of
+    ``dial_size`` passed on each step is a difference of floor divisions.
+
+    Examples
+    --------
+    >>> count_zero_crossings([-68, -30, 48, -5, 60, -55, -1, -99, 14, -82])
+    6
+    >>> count_zero_crossings([1000])
+    10
+    """
+    count = 0
+    position = start % dial_size
+    for batch in _batched_rotations(rotations, batch_size):
+        crossings, position = _count_batch_crossings(batch, position, dial_size)
+        count += crossings
+    return count
+
+
+def count_zero_crossings_loop(rotations: Iterable[int], dial_size: int=100, start: int=50) -> int:
+    """Reference implementation of count_zero_crossings, one rotation at a time."""
+    count = 0
+    position = start
+    for rotation in rotations:
+        full_turns = int(rotation / dial_size)
+        count += abs(full_turns)
+        # assert turn_dial(position, rotation) == rotation - full_turns * dial_size
+        rotation -= dial_size * full_turns # What's left after full turns
+
+        if not rotation:
+            continue
+
+        new_position = position + rotation
+        # Either you were close to 0 and rotation is negative and now new_position is negative
+        # OR position is close to 99 and rotation is positive and new_position is >= 100
+        if (
+            (position > 0 and new_position <= 0)
+            or (0 < position < dial_size and new_position >= dial_size)
+        ):
+            count += 1
+        position = new_position % dial_size
+    return count
+
+
+def _batched_rotations(rotations: Iterable[int], batch_size: int) -> Generator[np.ndarray, None, None]:
+    """Yield successive int64 arrays of at most ``batch_size`` rotations."""
+    if isinstance(rotations, np.ndarray):
+        for lo in range(0, len(rotations), batch_size):
+            yield rotations[lo:lo + batch_size].astype(np.int64, copy=False)
+        return
+    rotations = iter(rotations)
+    while batch := list(islice(rotations, batch_size)):
+        yield np.asarray(batch, dtype=np.int64)
+
+
+def _count_batch_landings(batch: np.ndarray, position: int, dial_size: int) -> tuple[int, int]:
+    """Count zero landings for one batch of rotations starting at ``position``.
+
+    Returns the landing count and the dial position after the batch.
+    """
+    if not len(batch):
+        return 0, position
+    positions = (position + np.cumsum(batch)) % dial_size
+    return int(np.count_nonzero(positions == 0)), int(positions[-1])
+
+
+def _count_batch_crossings(batch: np.ndarray, position: int, dial_size: int) -> tuple[int, int]:
+    """Count zero crossings for one batch of rotations starting at ``position``.
+
+    Returns the crossing count and the dial position after the batch.
+    """
+    if not len(batch):
+        return 0, position
+    # Unwrapped positions before and after every rotation
+    after = position + np.cumsum(batch)
+    before = np.empty_like(after)
+    before[0] = position
+    before[1:] = after[:-1]
+    # Turning right passes every multiple of dial_size in (before, after],
+    # turning left passes every multiple in [after, before).
+    right = after // dial_size - before // dial_size
+    left = (before - 1) // dial_size - (after - 1) // dial_size
+    crossings = np.where(batch > 0, right, left).sum()
+    return int(crossings), int(after[-1] % dial_size)
 
 
 def apply_rotations(rotations: Iterable[int], start: int=50,) -> Generator[int, None, None]:
@@ -48,6 +155,346 @@ def process_rotation(rotation: str) -> int:
     return sign * value
 
 
+def parse_rotation_bytes(data: bytes) -> np.ndarray:
+    """Decode newline separated rotations (e.g., b'R10\\nL20\\n') into an int64 array.
+
+    Trailing whitespace is ignored, blank lines are skipped and a trailing newline
+    is optional. Any other line that isn't an L or R followed by digits raises a
+    ValueError.
+
+    Examples
+    --------
+    >>> parse_rotation_bytes(b"L68\\nR48\\n\\nL5")
+    array([-68,  48,  -5])
+    >>> parse_rotation_bytes(b"L68 \\n")
+    array([-68])
+    >>> parse_rotation_bytes(b"R5\\r\\n")
+    array([5])
+    >>> parse_rotation_bytes(b"R5\\tx\\n")
+    Traceback (most recent call last):
+    ...
+    ValueError: Invalid rotation: b'R5\\tx'
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if not len(buf):
+        return np.empty(0, dtype=np.int64)
+    if buf[-1] != _NEWLINE:
+        buf = np.append(buf, np.uint8(_NEWLINE))
+
+    # Everything below is one entry per line rather than one per byte
+    index_dtype = np.int32 if len(buf) < 2**31 else np.int64
+    line_ends = np.flatnonzero(buf == _NEWLINE).astype(index_dtype)
+    line_starts = np.empty_like(line_ends)
+    line_starts[0] = 0
+    line_starts[1:] = line_ends[:-1] + 1
+    # Drop trailing whitespace (including a carriage return) before the newline
+    content_ends = line_ends.copy()
+    while True:
+        trailing = (content_ends > line_starts) & _IS_SPACE[buf[np.maximum(content_ends - 1, 0)]]
+        if not trailing.any():
+            break
+        content_ends -= trailing
+
+    # Walk back from the end of every line, one decimal place at a time
+    values = np.zeros(len(line_ends), dtype=np.int64)
+    n_digits = np.zeros(len(line_ends), dtype=np.uint8)
+    in_number = np.ones(len(line_ends), dtype=bool)
+    for place, power in enumerate(_POWERS_OF_TEN):
+        position = content_ends - (place + 1)
+        in_number &= position >= line_starts
+        digit = buf[np.maximum(position, 0)] - _ZERO  # Non-digit bytes wrap around to values >= 10
+        in_number &= digit < 10
+        if not in_number.any():
+            break
+        values += np.where(in_number, digit, 0) * power
+        n_digits += in_number
+    else:
+        raise ValueError("Rotation amount does not fit in a 64-bit integer.")
+
+    # A line is blank, or exactly one L/R followed by its digits
+    is_blank = content_ends == line_starts
+    first = buf[line_starts]
+    is_rotation = (
+        (n_digits > 0)
+        & (content_ends - n_digits.astype(index_dtype) - 1 == line_starts)
+        & ((first == ord("L")) | (first == ord("R")))
+    )
+    invalid = np.flatnonzero(~is_blank & ~is_rotation)
+    if len(invalid):
+        line = invalid[0]
+        raise ValueError(f"Invalid rotation: {buf[line_starts[line]:content_ends[line]].tobytes()!r}")
+
+    signs = np.where(first == ord("L"), -1, 1)
+    return (signs * values)[~is_blank]
+
+
+def iter_rotation_file(input_file: Path, chunk_bytes: int=1 << 20) -> Generator[np.ndarray, None, None]:
+    """Memory-map a rotation file and yield its rotations as int64 arrays.
+
+    Each chunk holds roughly ``chunk_bytes`` of input and always ends on a line
+    boundary, so memory use does not depend on the size of the file.
+    """
+    size = Path(input_file).stat().st_size
+    if not size:
+        return
+    with open(input_file, "rb") as fid, mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for lo, hi in _line_aligned_chunks(mm, 0, size, chunk_bytes):
+            yield parse_rotation_bytes(mm[lo:hi])
+
+
+def _line_aligned_chunks(
+        mm: mmap.mmap, lo: int, hi: int, chunk_bytes: int
+    ) -> Generator[tuple[int, int], None, None]:
+    """Split bytes ``[lo, hi)`` of a mapped file into ranges that end on a newline."""
+    while lo < hi:
+        stop = min(lo + chunk_bytes, hi)
+        if stop < hi:
+            newline = mm.rfind(b"\n", lo, stop)
+            if newline == -1:
+                newline = mm.find(b"\n", stop, hi)
+            stop = hi if newline == -1 else newline + 1
+        yield lo, stop
+        lo = stop
+
+
+def scan_rotation_file(
+        input_file: Path, dial_size: int=100, start: int=50, chunk_bytes: int=1 << 20
+    ) -> tuple[int, int]:
+    """Stream a rotation file and return the zero landing and zero crossing counts.
+
+    Counts match count_zero_landings and count_zero_crossings on the parsed file,
+    but only one chunk of rotations is held in memory at a time.
+    """
+    position = start % dial_size
+    landings = int(position == 0)
+    crossings = 0
+    for batch in iter_rotation_file(input_file, chunk_bytes=chunk_bytes):
+        batch_crossings, _ = _count_batch_crossings(batch, position, dial_size)
+        batch_landings, position = _count_batch_landings(batch, position, dial_size)
+        landings += batch_landings
+        crossings += batch_crossings
+    return landings, crossings
+
+
+# Chunked evaluation
+@dataclass(frozen=True)
+class DialSummary:
+    """Net effect of a run of rotations, for every possible start position.
+
+    ``landings[s]`` and ``crossings[s]`` are the zero landings and zero crossings
+    seen when the run starts with the dial at position ``s``. The starting
+    position itself is not counted as a landing.
+    """
+    offset: int
+    landings: np.ndarray
+    crossings: np.ndarray
+
+
+def summarize_rotations(rotations: np.ndarray, dial_size: int=100) -> DialSummary:
+    """Summarize a run of rotations so that it can be combined with its neighbours.
+
+    For a start ``s`` in ``[0, dial_size)`` and an offset ``x`` from it,
+    ``(s + x) // dial_size`` is ``x // dial_size`` plus one when ``s`` reaches
+    ``dial_size - x % dial_size``. Every crossing count is therefore a constant
+    plus a step function of ``s``, and all of them are tabulated in one pass.
+    """
+    rotations = np.asarray(rotations, dtype=np.int64)
+    after = np.cumsum(rotations)
+    before = np.concatenate(([0], after[:-1]))
+    right = rotations > 0
+    left = rotations < 0
+
+    def steps(x):
+        # Smallest start at which (s + x) // dial_size steps up; dial_size means never
+        remainder = x % dial_size
+        threshold = np.where(remainder, dial_size - remainder, dial_size)
+        return np.bincount(threshold, minlength=dial_size + 1)
+
+    base = (
+        (after[right] // dial_size - before[right] // dial_size).sum()
+        + ((before[left] - 1) // dial_size - (after[left] - 1) // dial_size).sum()
+    )
+    step_changes = (
+        steps(after[right]) - steps(before[right])
+        + steps(before[left] - 1) - steps(after[left] - 1)
+    )
+    crossings = base + np.cumsum(step_changes)[:dial_size]
+    landings = np.bincount(-after % dial_size, minlength=dial_size)
+    offset = int(after[-1] % dial_size) if len(after) else 0
+    return DialSummary(offset=offset, landings=landings, crossings=crossings)
+
+
+def combine_summaries(first: DialSummary, second: DialSummary) -> DialSummary:
+    """Summarize ``first`` followed by ``second``. The operation is associative."""
+    dial_size = len(first.landings)
+    # Where the second run starts, for each start of the first run
+    handover = (np.arange(dial_size) + first.offset) % dial_size
+    return DialSummary(
+        offset=(first.offset + second.offset) % dial_size,
+        landings=first.landings + second.landings[handover],
+        crossings=first.crossings + second.crossings[handover],
+    )
+
+
+def count_zeros_parallel(
+        input_file: Path,
+        dial_size: int=100,
+        start: int=50,
+        max_workers: int | None=None,
+        chunks_per_worker: int=4,
+    ) -> tuple[int, int]:
+    """Count zero landings and zero crossings in a rotation file using a process pool.
+
+    The file is split into line-aligned byte ranges, each worker summarizes its
+    ranges with summarize_rotations, and the summaries are combined in order.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    ranges = _split_file(input_file, max_workers * chunks_per_worker)
+    position = start % dial_size
+    if not ranges:
+        return int(position == 0), 0
+
+    summarize = partial(_summarize_file_range, input_file, dial_size=dial_size)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        summaries = executor.map(summarize, *zip(*ranges))
+        summary = reduce(combine_summaries, summaries)
+    landings = int(position == 0) + int(summary.landings[position])
+    return landings, int(summary.crossings[position])
+
+
+def simulate_dial_grid(
+        rotations: Iterable[int],
+        starts: Iterable[int],
+        dial_sizes: Iterable[int],
+        batch_size: int=1_000_000,
+    ) -> tuple[np.ndarray, np.ndarray]:
+    """Count zero landings and zero crossings for every (dial_size, start) pair.
+
+    Returns two arrays of shape ``(len(dial_sizes), len(starts))``. Starts are taken
+    modulo each dial size. The rotations are read once: each batch is summarized
+    per dial size and applied to the whole row of starts by indexing with the
+    current dial positions.
+
+    Examples
+    --------
+    >>> landings, crossings = simulate_dial_grid([-68, -30, 48, -5, 60, -55, -1, -99, 14, -82], [0, 50], [100])
+    >>> landings
+    array([[1, 3]])
+    >>> crossings
+    array([[4, 6]])
+    """
+    starts = np.asarray(list(starts), dtype=np.int64)
+    dial_sizes = np.asarray(list(dial_sizes), dtype=np.int64)
+    positions = starts[np.newaxis, :] % dial_sizes[:, np.newaxis]
+    landings = (positions == 0).astype(np.int64)
+    crossings = np.zeros_like(landings)
+    for batch in _batched_rotations(rotations, batch_size):
+        for row, dial_size in enumerate(dial_sizes):
+            summary = summarize_rotations(batch, int(dial_size))
+            landings[row] += summary.landings[positions[row]]
+            crossings[row] += summary.crossings[positions[row]]
+            positions[row] = (positions[row] + summary.offset) % dial_size
+    return landings, crossings
+
+
+def _split_file(input_file: Path, n_chunks: int) -> list[tuple[int, int]]:
+    """Split a file into at most ``n_chunks`` byte ranges that end on line boundaries."""
+    size = Path(input_file).stat().st_size
+    if not size:
+        return []
+    ranges = []
+    with open(input_file, "rb") as fid, mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lo = 0
+        for ii in range(1, n_chunks + 1):
+            hi = size * ii // n_chunks
+            if hi <= lo:
+                continue
+            newline = mm.find(b"\n", hi - 1)
+            hi = size if newline == -1 else newline + 1
+            ranges.append((lo, hi))
+            lo = hi
+            if lo >= size:
+                break
+    return ranges
+
+
+def _summarize_file_range(
+        input_file: Path, lo: int, hi: int, dial_size: int=100, chunk_bytes: int=1 << 20
+    ) -> DialSummary:
+    """Summarize the rotations stored in bytes ``[lo, hi)`` of a rotation file."""
+    summary = summarize_rotations(np.empty(0, dtype=np.int64), dial_size)
+    with open(input_file, "rb") as fid, mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start, stop in _line_aligned_chunks(mm, lo, hi, chunk_bytes):
+            chunk = summarize_rotations(parse_rotation_bytes(mm[start:stop]), dial_size)
+            summary = combine_summaries(summary, chunk)
+    return summary
+
+
+# Streaming
+class RotationStream:
+    """Running zero landing and zero crossing totals for rotations that arrive in pieces.
+
+    Bytes passed to ``feed`` are decoded a batch at a time. A trailing partial line
+    is held back until the rest of it arrives, and only the dial position is kept
+    between batches.
+    """
+
+    def __init__(self, dial_size: int=100, start: int=50):
+        self.dial_size = dial_size
+        self.position = start % dial_size
+        self.n_rotations = 0
+        self.landings = int(self.position == 0)
+        self.crossings = 0
+        self._partial_line = b""
+
+    def feed(self, data: bytes) -> None:
+        """Consume the complete lines in ``data`` and buffer the remainder."""
+        data = self._partial_line + data
+        cut = data.rfind(b"\n") + 1
+        self._partial_line = data[cut:]
+        self._update(parse_rotation_bytes(data[:cut]))
+
+    def close(self) -> None:
+        """Consume a final line that was not terminated by a newline."""
+        data, self._partial_line = self._partial_line, b""
+        self._update(parse_rotation_bytes(data))
+
+    def _update(self, batch: np.ndarray) -> None:
+        crossings, _ = _count_batch_crossings(batch, self.position, self.dial_size)
+        landings, self.position = _count_batch_landings(batch, self.position, self.dial_size)
+        self.n_rotations += len(batch)
+        self.landings += landings
+        self.crossings += crossings
+
+
+def follow_rotations(
+        fid: BinaryIO,
+        dial_size: int=100,
+        start: int=50,
+        report_every: int=100_000,
+        read_bytes: int=1 << 16,
+    ) -> Generator[tuple[int, int, int], None, None]:
+    """Read rotations from a binary stream as they arrive, e.g. ``sys.stdin.buffer``.
+
+    Yields ``(n_rotations, landings, crossings)`` each time another ``report_every``
+    rotations have been consumed, and when the stream ends with unreported rotations.
+    """
+    stream = RotationStream(dial_size=dial_size, start=start)
+    # read1 returns whatever is available instead of waiting for a full buffer
+    read = getattr(fid, "read1", fid.read)
+    next_report = report_every
+    reported = None
+    while data := read(read_bytes):
+        stream.feed(data)
+        if stream.n_rotations >= next_report:
+            reported = stream.n_rotations
+            yield stream.n_rotations, stream.landings, stream.crossings
+            next_report = (stream.n_rotations // report_every + 1) * report_every
+    stream.close()
+    if stream.n_rotations != reported:
+        yield stream.n_rotations, stream.landings, stream.crossings
+
+
 def get_default_rotations() -> list[str]:
     """Return the default list of dial rotations provided by AoC."""
     return [
@@ -62,41 +509,44 @@ if __name__ == "__main__":
     parser.add_argument(
         "--input_file", type=Path, required=False, default=None, help="Path to the input file containing dial rotations."
     )
+    parser.add_argument(
+        "--workers", type=int, required=False, default=None, help="Number of processes used to scan --input_file."
+    )
+    parser.add_argument(
+        "--follow", action="store_true", help="Read rotations incrementally (from stdin unless --input_file is given) and print running totals."
+    )
+    parser.add_argument(
+        "--report_every", type=int, required=False, default=100_000, help="Number of rotations between running totals in --follow mode."
+    )
     args = parser.parse_args()
+    if args.follow:
+        if args.input_file is None:
+            fid = sys.stdin.buffer
+        else:
+            fid = args.input_file.expanduser().resolve().open("rb")
+        with fid:
+            for n_rotations, zero_count, count in follow_rotations(fid, report_every=args.report_every):
+                print(f"{n_rotations} rotations: {zero_count} landings on 0, {count} passes of 0.", flush=True)
+        sys.exit()
+
     if args.input_file is None:
         # Example Case
-        rotations = get_default_rotations()
+        rotations = list(map(process_rotation, get_default_rotations()))
+        zero_count = count_zero_landings(rotations)
+        count = count_zero_crossings(rotations)
+        assert count == count_zero_crossings_loop(rotations), "Vectorized and loop counts disagree!"
     else:
-        rotations = args.input_file.expanduser().resolve().read_text().splitlines()
-    
-    # Data Munging
-    rotations = list(map(process_rotation, rotations))
+        # Stream the file so that huge rotation logs don't have to fit in memory
+        input_file = args.input_file.expanduser().resolve()
+        if args.workers is None:
+            zero_count, count = scan_rotation_file(input_file)
+        else:
+            zero_count, count = count_zeros_parallel(input_file, max_workers=args.workers)
 
     # Part 1
-    zero_count = count_zero_landings(rotations)
     print(f"The dial landed on position 0 a total of {zero_count} times.")
 
     # Part 2
-    dial_size = 100
-    count = 0
-    position = 50
-    for rotation in rotations:
-        full_turns = int(rotation / dial_size)
-        count += abs(full_turns)
-        # assert turn_dial(position, rotation) == rotation - full_turns * dial_size
-        rotation -= dial_size * full_turns # What's left after full turns
-
-        if not rotation:
-            continue
-
-        new_position = position + rotation
-        # Either you were close to 0 and rotation is negative and now new_position is negative
-        # OR position is close to 99 and rotation is positive and new_position is >= 100
-        if (
-            (position > 0 and new_position <= 0)
-            or (0 < position <= 99 and new_position >= 100)
-        ):
-            count += 1
-        position = new_position % 100
     print(f"The dial passed position 0 a total of {count} times.")
-    assert count == 6858, "Incorrect answer for part 2!"
\ No newline at end of file
+    if args.input_file is not None:
+        assert count == 6858, "Incorrect answer for part 2!"
\ No newline at end of file
@@ -1,6 +1,16 @@
 """AoC 2025 Day 2: Gift Shop Inventory Validation. Key concept: String Periodicity."""
+import argparse
+from collections.abc import Callable
 from pathlib import Path
 import re
+from time import perf_counter
+import tracemalloc
+
+import numpy as np
+
+
+_POWERS_OF_TEN = 10 ** np.arange(1, 19, dtype=np.int64)
+_PERIODIC_PATTERN = re.compile(r"^(\d+)\1+$")
 
 
 def get_toy_data() -> str:
@@ -64,74 +74,296 @@ def is_periodic(product_id: str) -> bool:
     return product_id in (product_id + product_id)[1:-1]
 
 
+def is_periodic_regex(product_id: str) -> bool:
+    """Determine if string consists of a repeated substring, using a backreference regex."""
+    return _PERIODIC_PATTERN.match(str(product_id)) is not None
+
+
+def is_periodic_brute_force(product_id: str) -> bool:
+    """Determine if string consists of a repeated substring by trying every block length. Complexity O(n^2)?"""
+    product_id = str(product_id)
+    n = len(product_id)
+    for block_size in range(1, n):
+        if n % block_size != 0:
+            continue
+        if product_id[:block_size] * (n // block_size) == product_id:
+            return True
+    return False
+
+
+def classify_product_ids(product_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized is_invalid and is_periodic for an array of non-negative product IDs.
+
+    An L digit ID repeats a p digit block exactly when it is divisible by
+    ``(10**L - 1) // (10**p - 1)``, so each digit length only needs a handful of
+    modulo operations over the IDs of that length.
+
+    Returns
+    -------
+    doubled : np.ndarray of bool
+        IDs whose first half equals their second half (see is_invalid).
+    periodic : np.ndarray of bool
+        IDs made of a digit block repeated at least twice (see is_periodic).
+
+    Examples
+    --------
+    >>> classify_product_ids(np.array([11, 12, 111, 1212, 121212, 123123]))
+    (array([ True, False, False,  True, False,  True]), array([ True, False,  True,  True,  True,  True]))
+    """
+    product_ids = np.asarray(product_ids, dtype=np.int64)
+    n_digits = np.searchsorted(_POWERS_OF_TEN, product_ids, side="right") + 1
+    doubled = np.zeros(product_ids.shape, dtype=bool)
+    periodic = np.zeros(product_ids.shape, dtype=bool)
+    for length in np.unique(n_digits):
+        length = int(length)
+        in_length = n_digits == length
+        ids = product_ids[in_length]
+        is_periodic_ = np.zeros(ids.shape, dtype=bool)
+        for block_size in range(1, length):
+            if length % block_size:
+                continue
+            is_repeat = ids % ((10**length - 1) // (10**block_size - 1)) == 0
+            is_periodic_ |= is_repeat
+            if 2 * block_size == length:
+                doubled[in_length] = is_repeat
+        periodic[in_length] = is_periodic_
+    return doubled, periodic
+
+
+def get_product_id_ranges(string: str) -> list[tuple[int, int]]:
+    """Given a string of product ID ranges, return the (start, stop) pairs."""
+    return [
+        tuple(int(part) for part in product_id_range.split("-"))
+        for product_id_range in string.split(",")
+    ]
+
+
+def count_and_sum_repeated(lo: int, hi: int, min_repeats: int=2) -> tuple[int, int]:
+    """Count and sum the IDs in [lo, hi] made of a digit block repeated at least `min_repeats` times.
+
+    An L digit ID made of a p digit block is ``block * (10**L - 1) // (10**p - 1)``,
+    so the matching IDs for each block length form an arithmetic progression. The
+    progressions for different block lengths overlap, so IDs are attributed to
+    their shortest block by subtracting the counts of its divisors.
+
+    Examples
+    --------
+    >>> count_and_sum_repeated(95, 115)
+    (2, 210)
+    >>> count_and_sum_repeated(2121212118, 2121212124)
+    (1, 2121212121)
+    """
+    count = total = 0
+    for n_digits in range(len(str(max(lo, 1))), len(str(max(hi, 1))) + 1):
+        block_sizes = [size for size in range(1, n_digits) if n_digits % size == 0]
+        # Count and sum of the IDs whose shortest repeating block has each size
+        shortest: dict[int, tuple[int, int]] = {}
+        for size in block_sizes:
+            size_count, size_total = _count_and_sum_blocks(lo, hi, n_digits, size)
+            for divisor in shortest:
+                if size % divisor == 0:
+                    size_count -= shortest[divisor][0]
+                    size_total -= shortest[divisor][1]
+            shortest[size] = (size_count, size_total)
+            if n_digits // size >= min_repeats:
+                count += size_count
+                total += size_total
+    return count, total
+
+
+def count_and_sum_doubled(lo: int, hi: int) -> tuple[int, int]:
+    """Count and sum the IDs in [lo, hi] whose first half equals their second half.
+
+    Examples
+    --------
+    >>> count_and_sum_doubled(1188511880, 1188511890)
+    (1, 1188511885)
+    """
+    count = total = 0
+    for n_digits in range(len(str(max(lo, 1))), len(str(max(hi, 1))) + 1):
+        if n_digits % 2 == 0:
+            half_count, half_total = _count_and_sum_blocks(lo, hi, n_digits, n_digits // 2)
+            count += half_count
+            total += half_total
+    return count, total
+
+
+def _count_and_sum_blocks(lo: int, hi: int, n_digits: int, block_size: int) -> tuple[int, int]:
+    """Count and sum the `n_digits` long IDs in [lo, hi] that repeat a `block_size` digit block."""
+    multiplier = (10**n_digits - 1) // (10**block_size - 1)
+    first_block = max(10**(block_size - 1), -(-lo // multiplier))
+    last_block = min(10**block_size - 1, hi // multiplier)
+    if last_block < first_block:
+        return 0, 0
+    count = last_block - first_block + 1
+    return count, multiplier * (first_block + last_block) * count // 2
+
+
 ################# Part 1: String is a single repeated substring #######################
 
 
-# First try with toy data from AoC
-print("Testing with toy data:")
-string = get_toy_data()
-all_product_ids = get_all_product_ids(string)
+def test_part_1():
+    """Test our solution on the AoC toy data."""
+    all_product_ids = get_all_product_ids(get_toy_data())
+    invalid_product_ids = get_invalid_product_ids(all_product_ids)
+    assert len(invalid_product_ids) == 8, "Incorrect number of invalid product IDs found!"
+    assert sum(invalid_product_ids) == 1227775554, "Incorrect sum of invalid product IDs!"
+    return invalid_product_ids
+
+
+def solve_part_1():
+    """Return the invalid product IDs in our real input data."""
+    string = get_input_data()
+    all_product_ids = get_all_product_ids(string)
+    invalid_product_ids = get_invalid_product_ids(all_product_ids)
 
-invalid_product_ids = get_invalid_product_ids(all_product_ids)
-print(f"Number of invalid product IDs: {len(invalid_product_ids)}")
-assert len(invalid_product_ids) == 8, "Incorrect number of invalid product IDs found!"
-assert sum(invalid_product_ids) == 1227775554, "Incorrect sum of invalid product IDs!"
+    # Vectorized classification of the expanded IDs
+    doubled_mask, _ = classify_product_ids(np.asarray(all_product_ids))
+    assert np.asarray(all_product_ids)[doubled_mask].tolist() == invalid_product_ids
+
+    # Closed form, without expanding the ranges
+    doubled = [count_and_sum_doubled(start, stop) for start, stop in get_product_id_ranges(string)]
+    assert sum(count for count, _ in doubled) == len(invalid_product_ids)
+    assert sum(total for _, total in doubled) == sum(invalid_product_ids)
+    return invalid_product_ids
 
-# Now with our real input data
-print("\nNow with real input data:")
-string = get_input_data()
-all_product_ids = get_all_product_ids(string)
-invalid_product_ids = get_invalid_product_ids(all_product_ids)
-print(f"Number of invalid product IDs: {len(invalid_product_ids)}")
-print(f"Sum of invalid product IDs: {sum(invalid_product_ids)}")
 
 ############# Part 2: Detect periodicity in product IDs via rotation method ###########
 #
 # References:    https://algo.monster/liteproblems/459
 #               https://www.baeldung.com/cs/check-string-periodicity
 
-# First try with toy data from AoC
-print("\nTesting periodicity with toy data:")
-string = get_toy_data()
-all_product_ids = get_all_product_ids(string)
-periodic_product_ids = [pid for pid in all_product_ids if is_periodic(pid)]
-print(f"Number of periodic product IDs: {len(periodic_product_ids)}")
-assert len(periodic_product_ids) == 13, "Incorrect number of periodic product IDs found"
-assert sum(periodic_product_ids) == 4174379265, "Incorrect sum of periodic product IDs!"
-
-# Now with our real input data
-print("\nNow with real input data:")
-string = get_input_data()
-all_product_ids = get_all_product_ids(string)
-periodic_product_ids = [pid for pid in all_product_ids if is_periodic(pid)]
-print(f"Number of periodic product IDs: {len(periodic_product_ids)}")
-print(f"Sum of periodic product IDs: {sum(periodic_product_ids)}")
-
-assert len(periodic_product_ids) == 859
-assert sum(periodic_product_ids) == 14582313461
-
-
-# Brute Force approach to check periodicity. Complexity O(n^2)?
-invalid_ids = []
-# regex approach:
-invalid_ids_re = []
-for pid in all_product_ids:
-    s = str(pid)
-    n = len(s)
-    re_pattern = re.compile(r"^(\d+)\1+$")
-    if re_pattern.match(s):
-        invalid_ids_re.append(int(s))
-    for si in range(1, n):
-        if n % si != 0:
-            continue
-        substring = s[:si]
-        repetitions = n // si
-        if substring * repetitions == s:
-            invalid_ids.append(int(s))
-            break
 
-assert len(invalid_ids) == 859, "Brute force approach gave incorrect results!"
-assert sum(invalid_ids) == 14582313461, "Brute force approach gave incorrect results!"
+def test_part_2():
+    """Test our solution on the AoC toy data."""
+    all_product_ids = get_all_product_ids(get_toy_data())
+    periodic_product_ids = [pid for pid in all_product_ids if is_periodic(pid)]
+    assert len(periodic_product_ids) == 13, "Incorrect number of periodic product IDs found"
+    assert sum(periodic_product_ids) == 4174379265, "Incorrect sum of periodic product IDs!"
+    return periodic_product_ids
+
+
+def solve_part_2():
+    """Return the periodic product IDs in our real input data."""
+    string = get_input_data()
+    all_product_ids = get_all_product_ids(string)
+    periodic_product_ids = [pid for pid in all_product_ids if is_periodic(pid)]
+
+    # Vectorized classification of the expanded IDs
+    _, periodic_mask = classify_product_ids(np.asarray(all_product_ids))
+    assert np.asarray(all_product_ids)[periodic_mask].tolist() == periodic_product_ids
+
+    # Closed form, without expanding the ranges
+    repeated = [count_and_sum_repeated(start, stop) for start, stop in get_product_id_ranges(string)]
+    assert sum(count for count, _ in repeated) == len(periodic_product_ids)
+    assert sum(total for _, total in repeated) == sum(periodic_product_ids)
+    return periodic_product_ids
+
+
+def check_brute_force_detectors():
+    """Check the brute force and regex detectors against the real input data."""
+    all_product_ids = get_all_product_ids(get_input_data())
+
+    invalid_ids = [pid for pid in all_product_ids if is_periodic_brute_force(pid)]
+    assert len(invalid_ids) == 859, "Brute force approach gave incorrect results!"
+    assert sum(invalid_ids) == 14582313461, "Brute force approach gave incorrect results!"
+
+    invalid_ids_re = [pid for pid in all_product_ids if is_periodic_regex(pid)]
+    assert len(invalid_ids_re) == 859, "Brute force Regex approach gave incorrect results!"
+    assert sum(invalid_ids_re) == 14582313461, "Brute force Regex approach gave incorrect results!"
+
+
+################################### Benchmarks #########################################
+
+
+def get_detectors() -> dict[str, Callable[[int], bool]]:
+    """Return the per-ID periodicity detectors, keyed by name."""
+    return {
+        "is_invalid": is_invalid,
+        "is_periodic": is_periodic,
+        "regex": is_periodic_regex,
+        "brute_force": is_periodic_brute_force,
+    }
+
+
+def benchmark_detectors(
+        widths: tuple[int, ...]=(1_000, 10_000, 100_000),
+        digit_lengths: tuple[int, ...]=(4, 8, 12, 16),
+    ) -> list[dict]:
+    """Time every detector on ranges of each width, starting at the smallest ID of each digit length.
+
+    Widths larger than the number of IDs with that digit length are clamped to it,
+    so every ID in a row has the reported number of digits.
+
+    Each run is timed without tracing, then repeated under tracemalloc for peak memory.
+    Throughput is in IDs per second and peak memory is in bytes.
+    """
+    results = []
+    for n_digits in digit_lengths:
+        # Clamp each range to the IDs that actually have n_digits digits
+        n_ids_with_length = 9 * 10**(n_digits - 1)
+        for width in sorted({min(width, n_ids_with_length) for width in widths}):
+            product_ids = range(10**(n_digits - 1), 10**(n_digits - 1) + width)
+            for name, detector in get_detectors().items():
+                tic = perf_counter()
+                n_matches = sum(map(detector, product_ids))
+                elapsed = perf_counter() - tic
+
+                tracemalloc.start()
+                sum(map(detector, product_ids))
+                _, peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                results.append(
+                    {
+                        "detector": name,
+                        "n_digits": n_digits,
+                        "width": width,
+                        "matches": n_matches,
+                        "ids_per_sec": width / elapsed,
+                        "peak_memory": peak_memory,
+                    }
+                )
+    return results
+
+
+def print_benchmark(results: list[dict]) -> None:
+    """Print benchmark_detectors results as a table."""
+    print(f"{'detector':<12} {'digits':>6} {'width':>8} {'matches':>8} {'IDs/sec':>12} {'peak KiB':>9}")
+    for result in results:
+        print(
+            f"{result['detector']:<12} {result['n_digits']:>6} {result['width']:>8} "
+            f"{result['matches']:>8} {result['ids_per_sec']:>12,.0f} {result['peak_memory'] / 1024:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find invalid product IDs in the gift shop inventory.")
+    parser.add_argument(
+        "--benchmark", action="store_true", help="Benchmark the periodicity detectors instead of solving the puzzle."
+    )
+    args = parser.parse_args()
+    if args.benchmark:
+        print_benchmark(benchmark_detectors())
+    else:
+        print("Testing with toy data:")
+        invalid_product_ids = test_part_1()
+        print(f"Number of invalid product IDs: {len(invalid_product_ids)}")
+
+        print("\nNow with real input data:")
+        invalid_product_ids = solve_part_1()
+        print(f"Number of invalid product IDs: {len(invalid_product_ids)}")
+        print(f"Sum of invalid product IDs: {sum(invalid_product_ids)}")
+
+        print("\nTesting periodicity with toy data:")
+        periodic_product_ids = test_part_2()
+        print(f"Number of periodic product IDs: {len(periodic_product_ids)}")
+
+        print("\nNow with real input data:")
+        periodic_product_ids = solve_part_2()
+        print(f"Number of periodic product IDs: {len(periodic_product_ids)}")
+        print(f"Sum of periodic product IDs: {sum(periodic_product_ids)}")
+        assert len(periodic_product_ids) == 859
+        assert sum(periodic_product_ids) == 14582313461
 
-assert len(invalid_ids_re) == 859, "Brute force Regex approach gave incorrect results!"
-assert sum(invalid_ids_re) == 14582313461, "Brute force Regex approach gave incorrect results!"
\ No newline at end of file
+        check_brute_force_detectors()
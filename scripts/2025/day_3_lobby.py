@@ -1,6 +1,12 @@
 """AoC 2025 Day 3: Lobby Layout - Joltage Maximization. Key concept: Monotonic Stack."""
+from collections.abc import Generator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+import os
 from pathlib import Path
 
+import numpy as np
+
 
 def get_toy_data() -> str:
     """Return the AoC example Joltage data."""
@@ -43,42 +49,195 @@ def max_joltage(bank: str, n_cells: int=2) -> str:
     return int("".join(stack))
 
 
-banks = get_toy_data().strip().split("\n")
-max_voltages = []
-for bank in banks:
-    voltage = max_joltage(bank)
-    max_voltages.append(voltage)
-max_voltage = sum(max_voltages)
-
-assert max_voltages == [98, 89, 78, 92]
-assert max_voltage == 357
-
-banks = get_input_data().strip().split("\n")
-max_voltages = []
-for bank in banks:
-    voltage = max_joltage(bank)
-    max_voltages.append(voltage)
-max_voltage = sum(max_voltages)
-
-print(f"The highest possible total voltage is {max_voltage}.")
-assert max_voltage == 16946
-
-# Part 2 - now with 12 cells per bank
-banks = get_toy_data().strip().split("\n")
-
-max_voltages = []
-for bi, bank in enumerate(banks):
-    voltage = max_joltage(bank, n_cells=12)
-    max_voltages.append(voltage)
-max_voltage = sum(max_voltages)
-assert max_voltages == [987654321111, 811111111119, 434234234278, 888911112111]
-assert max_voltage == 3121910778619
-
-# Part 2 with input data:
-banks = get_input_data().strip().split("\n")
-max_voltages = []
-for bi, bank in enumerate(banks):
-    voltage = max_joltage(bank, n_cells=12)
-    max_voltages.append(voltage)
-max_voltage = sum(max_voltages)
-print(f"The highest possible total voltage with 12 cells is {max_voltage}.")
\ No newline at end of file
+class JoltageIndex:
+    """Sparse table over a bank that answers max_joltage for any number of cells.
+
+    ``table[level][i]`` is the position of the first largest digit in
+    ``bank[i:i + 2**level]``. Any window is covered by two overlapping blocks, so
+    each cell of the answer is an O(1) lookup after an O(n log n) build.
+
+    Examples
+    --------
+    >>> index = JoltageIndex("818181911112111")
+    >>> index.max_joltage(2), index.max_joltage(12)
+    (92, 888911112111)
+    """
+
+    def __init__(self, bank: str):
+        self.bank = bank
+        self.table = [list(range(len(bank)))]
+        size = 1
+        while 2 * size <= len(bank):
+            previous = self.table[-1]
+            self.table.append(
+                [
+                    self._first_max(previous[i], previous[i + size])
+                    for i in range(len(bank) - 2 * size + 1)
+                ]
+            )
+            size *= 2
+
+    def _first_max(self, left: int, right: int) -> int:
+        return right if self.bank[right] > self.bank[left] else left
+
+    def argmax(self, lo: int, hi: int) -> int:
+        """Return the position of the first largest digit in ``bank[lo:hi + 1]``."""
+        level = (hi - lo + 1).bit_length() - 1
+        row = self.table[level]
+        return self._first_max(row[lo], row[hi - (1 << level) + 1])
+
+    def max_joltage(self, n_cells: int=2) -> int:
+        """Same as max_joltage(bank, n_cells), without rescanning the bank."""
+        chosen = []
+        lo = 0
+        for cell in range(n_cells):
+            position = self.argmax(lo, len(self.bank) - n_cells + cell)
+            chosen.append(self.bank[position])
+            lo = position + 1
+        return int("".join(chosen))
+
+
+def parse_banks(data: str) -> tuple[np.ndarray, np.ndarray]:
+    """Load newline separated banks into a 2D uint8 digit matrix.
+
+    Shorter banks are right-padded with zeros. Returns the matrix and the
+    length of every bank.
+    """
+    banks = data.split()
+    lengths = np.fromiter(map(len, banks), dtype=np.int64, count=len(banks))
+    width = int(lengths.max()) if len(banks) else 0
+    if np.all(lengths == width):
+        digits = np.frombuffer("".join(banks).encode(), dtype=np.uint8)
+        return (digits - ord("0")).reshape(len(banks), width), lengths
+    digits = np.zeros((len(banks), width), dtype=np.uint8)
+    for row, bank in enumerate(banks):
+        digits[row, :len(bank)] = np.frombuffer(bank.encode(), dtype=np.uint8) - ord("0")
+    return digits, lengths
+
+
+def max_joltage_batch(
+        digits: np.ndarray, lengths: np.ndarray | None=None, n_cells: int=2
+    ) -> tuple[np.ndarray, int]:
+    """max_joltage for every row of a digit matrix (see parse_banks) at once.
+
+    Cell j of every bank is the first largest digit between the cell after
+    cell j - 1 and the last position that still leaves room for the remaining
+    cells. Returns the per-bank joltages and their total.
+
+    Examples
+    --------
+    >>> max_joltage_batch(*parse_banks(get_toy_data()))
+    (array([98, 89, 78, 92]), 357)
+    """
+    n_banks, width = digits.shape
+    if lengths is None:
+        lengths = np.full(n_banks, width)
+    rows = np.arange(n_banks)
+    columns = np.arange(width)
+    # Signed so that positions outside the window can be masked with -1
+    candidates = digits.astype(np.int8)
+    # Python ints once the joltage no longer fits in an int64
+    joltages = np.zeros(n_banks, dtype=np.int64 if n_cells < 19 else object)
+    first = np.zeros(n_banks, dtype=np.int64)
+    for cell in range(n_cells):
+        last = lengths - (n_cells - cell)
+        allowed = (columns >= first[:, np.newaxis]) & (columns <= last[:, np.newaxis])
+        chosen = np.argmax(np.where(allowed, candidates, -1), axis=1)
+        joltages = joltages * 10 + candidates[rows, chosen]
+        first = chosen + 1
+    return joltages, sum(joltages.tolist())
+
+
+def total_joltage_parallel(
+        input_file: Path, n_cells: int=2, max_workers: int | None=None, chunk_bytes: int=1 << 20
+    ) -> int:
+    """Sum max_joltage over every bank in a file, spreading line-aligned chunks over a process pool.
+
+    At most two chunks per worker are in flight, and partial sums are added as
+    soon as they complete, so memory does not grow with the size of the file.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    sum_chunk = partial(_sum_joltages, n_cells=n_cells)
+    total = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for chunk in iter_bank_chunks(input_file, chunk_bytes=chunk_bytes):
+            pending.add(executor.submit(sum_chunk, chunk))
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                total += sum(future.result() for future in done)
+        total += sum(future.result() for future in wait(pending).done)
+    return total
+
+
+def iter_bank_chunks(input_file: Path, chunk_bytes: int=1 << 20) -> Generator[bytes, None, None]:
+    """Read a bank file in pieces of roughly ``chunk_bytes`` that end on a line boundary."""
+    remainder = b""
+    with open(input_file, "rb") as fid:
+        while data := fid.read(chunk_bytes):
+            data = remainder + data
+            cut = data.rfind(b"\n") + 1
+            remainder = data[cut:]
+            if cut:
+                yield data[:cut]
+    if remainder.strip():
+        yield remainder
+
+
+def _sum_joltages(chunk: bytes, n_cells: int=2) -> int:
+    return sum(max_joltage(bank, n_cells=n_cells) for bank in chunk.decode().split())
+
+
+if __name__ == "__main__":
+    banks = get_toy_data().strip().split("\n")
+    max_voltages = []
+    for bank in banks:
+        voltage = max_joltage(bank)
+        max_voltages.append(voltage)
+    max_voltage = sum(max_voltages)
+
+    assert max_voltages == [98, 89, 78, 92]
+    assert max_voltage == 357
+
+    banks = get_input_data().strip().split("\n")
+    max_voltages = []
+    for bank in banks:
+        voltage = max_joltage(bank)
+        max_voltages.append(voltage)
+    max_voltage = sum(max_voltages)
+
+    print(f"The highest possible total voltage is {max_voltage}.")
+    assert max_voltage == 16946
+    assert max_joltage_batch(*parse_banks(get_input_data()))[1] == 16946
+
+    # Part 2 - now with 12 cells per bank
+    banks = get_toy_data().strip().split("\n")
+
+    max_voltages = []
+    for bi, bank in enumerate(banks):
+        voltage = max_joltage(bank, n_cells=12)
+        max_voltages.append(voltage)
+    max_voltage = sum(max_voltages)
+    assert max_voltages == [987654321111, 811111111119, 434234234278, 888911112111]
+    assert max_voltage == 3121910778619
+    assert max_joltage_batch(*parse_banks(get_toy_data()), n_cells=12)[0].tolist() == max_voltages
+
+    # Part 2 with input data:
+    banks = get_input_data().strip().split("\n")
+    max_voltages = []
+    for bi, bank in enumerate(banks):
+        voltage = max_joltage(bank, n_cells=12)
+        max_voltages.append(voltage)
+    max_voltage = sum(max_voltages)
+    print(f"The highest possible total voltage with 12 cells is {max_voltage}.")
+    assert max_joltage_batch(*parse_banks(get_input_data()), n_cells=12)[1] == max_voltage
+
+    # Parallel streaming solver
+    input_path = Path(__file__).resolve().parent / "assets" / "day_3_lobby.txt"
+    assert total_joltage_parallel(input_path, chunk_bytes=4096) == 16946
+    assert total_joltage_parallel(input_path, n_cells=12, chunk_bytes=4096) == max_voltage
+
+    # Both parts from one index per bank
+    indices = [JoltageIndex(bank) for bank in banks]
+    assert sum(index.max_joltage(2) for index in indices) == 16946
+    assert sum(index.max_joltage(12) for index in indices) == max_voltage
\ No newline at end of file
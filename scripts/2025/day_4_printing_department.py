@@ -1,6 +1,12 @@
+from collections import deque
+from collections.abc import Generator
+import mmap
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from warnings import warn
 
+import numpy as np
+
 def get_toy_data():
     return (
         "..@@.@@@@.\n"
@@ -91,6 +97,247 @@ def count_rolls(grid: list[str], count_accessible: bool=False) -> int:
     )
 
 
+def grid_to_array(grid: list[str]) -> np.ndarray:
+    """Return a boolean array that is True wherever the grid holds a roll ("@")."""
+    n_cols = len(grid[0]) if grid else 0
+    cells = np.frombuffer("".join(grid).encode(), dtype=np.uint8).reshape(len(grid), n_cols)
+    return cells == ord("@")
+
+
+def count_adjacent_rolls(rolls: np.ndarray) -> np.ndarray:
+    """Count the rolls among the 8 neighbors of every cell, using shifted slices of a padded grid."""
+    padded = np.pad(rolls, 1).astype(np.uint8)
+    n_rows, n_cols = rolls.shape
+    counts = np.zeros(rolls.shape, dtype=np.uint8)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dy or dx:
+                counts += padded[1 + dy:1 + dy + n_rows, 1 + dx:1 + dx + n_cols]
+    return counts
+
+
+def accessible_rolls(grid: list[str], max_adjacent_rolls: int=4) -> tuple[np.ndarray, int]:
+    """Vectorized forklift: mask of rolls with fewer than `max_adjacent_rolls` neighbors, and their count."""
+    rolls = grid_to_array(grid)
+    accessible = rolls & (count_adjacent_rolls(rolls) < max_adjacent_rolls)
+    return accessible, int(accessible.sum())
+
+
+def peel_rolls(grid: list[str], max_adjacent_rolls: int=4) -> tuple[int, np.ndarray, list[str]]:
+    """Part 2 with a worklist: remove accessible rolls until none are left.
+
+    Every roll keeps a count of its neighboring rolls. Removing a roll only
+    decrements its 8 neighbors, and a neighbor joins the queue once its count
+    drops below `max_adjacent_rolls`, so each roll is handled a bounded number of times.
+
+    Returns the number of removed rolls, the forklift pass in which each roll
+    was removed (0 for empty cells and rolls that stay), and the final grid.
+    """
+    rolls = grid_to_array(grid)
+    n_rows, n_cols = rolls.shape
+    counts = count_adjacent_rolls(rolls).astype(np.int64)
+    waves = np.zeros(rolls.shape, dtype=np.int64)
+
+    queue = deque()
+    for y, x in zip(*np.nonzero(rolls & (counts < max_adjacent_rolls))):
+        waves[y, x] = 1
+        queue.append((int(y), int(x)))
+
+    n_removed = 0
+    while queue:
+        y, x = queue.popleft()
+        rolls[y, x] = False
+        n_removed += 1
+        for ny in range(max(y - 1, 0), min(y + 2, n_rows)):
+            for nx in range(max(x - 1, 0), min(x + 2, n_cols)):
+                if not rolls[ny, nx] or waves[ny, nx]:
+                    continue
+                counts[ny, nx] -= 1
+                if counts[ny, nx] < max_adjacent_rolls:
+                    # Accessible in the pass after the one that removed its neighbor
+                    waves[ny, nx] = waves[y, x] + 1
+                    queue.append((ny, nx))
+
+    final_grid = ["".join("@" if roll else "." for roll in row) for row in rolls.tolist()]
+    return n_removed, waves, final_grid
+
+
+def core_numbers(grid: list[str]) -> np.ndarray:
+    """Highest `max_adjacent_rolls` at which each roll survives peel_rolls (-1 for empty cells).
+
+    This is the k-core number of the roll on the 8-neighbor grid graph. Rolls are
+    taken in order of their current neighbor count, using one bucket per count (0-8),
+    and each removal decrements the counts of its remaining neighbors.
+    """
+    rolls = grid_to_array(grid)
+    n_rows, n_cols = rolls.shape
+    counts = count_adjacent_rolls(rolls).astype(np.int64)
+    cores = np.full(rolls.shape, -1, dtype=np.int64)
+
+    buckets = [[] for _ in range(9)]
+    for y, x in zip(*np.nonzero(rolls)):
+        buckets[counts[y, x]].append((int(y), int(x)))
+
+    core = 0
+    while True:
+        # Smallest current count. Entries whose count has since dropped are stale.
+        count = next((c for c in range(9) if buckets[c]), None)
+        if count is None:
+            break
+        y, x = buckets[count].pop()
+        if not rolls[y, x] or counts[y, x] != count:
+            continue
+        core = max(core, count)
+        cores[y, x] = core
+        rolls[y, x] = False
+        for ny in range(max(y - 1, 0), min(y + 2, n_rows)):
+            for nx in range(max(x - 1, 0), min(x + 2, n_cols)):
+                if rolls[ny, nx]:
+                    counts[ny, nx] -= 1
+                    buckets[counts[ny, nx]].append((ny, nx))
+    return cores
+
+
+def removable_rolls_by_threshold(cores: np.ndarray) -> np.ndarray:
+    """Number of rolls peel_rolls removes for every `max_adjacent_rolls` from 0 to 9, from core_numbers."""
+    histogram = np.bincount(cores[cores >= 0], minlength=9)
+    return np.concatenate(([0], np.cumsum(histogram)))
+
+
+class BitGrid:
+    """Roll grid stored as one arbitrary-precision int per row, with bit x set for a roll in column x.
+
+    Neighbor counts are kept bit-sliced: four ints per row hold the 1s, 2s, 4s and
+    8s bit of the count for every column, and the 8 shifted neighbor rows are added
+    into them with word-parallel half adders.
+    """
+
+    _TO_BITS = str.maketrans({"@": "1", ".": "0", "x": "0"})
+    _FROM_BITS = str.maketrans({"1": "@", "0": "."})
+
+    def __init__(self, rows: list[int], width: int):
+        self.rows = rows
+        self.width = width
+        self.full = (1 << width) - 1
+
+    @classmethod
+    def from_lines(cls, grid: list[str]) -> "BitGrid":
+        width = len(grid[0]) if grid else 0
+        # Reverse each row so that column 0 is the least significant bit
+        return cls([int(row[::-1].translate(cls._TO_BITS) or "0", 2) for row in grid], width)
+
+    def to_lines(self, accessible: list[int] | None=None) -> list[str]:
+        """Render the grid, marking the rolls in `accessible` with "x" like forklift does."""
+        lines = []
+        for yi, row in enumerate(self.rows):
+            line = format(row, f"0{self.width}b")[::-1].translate(self._FROM_BITS)
+            if accessible is not None and accessible[yi]:
+                marks = format(accessible[yi], f"0{self.width}b")[::-1]
+                line = "".join("x" if mark == "1" else col for col, mark in zip(line, marks))
+            lines.append(line)
+        return lines
+
+    def count(self) -> int:
+        return sum(row.bit_count() for row in self.rows)
+
+    def adjacent_counts(self, yi: int) -> list[int]:
+        """Bit planes of the neighbor count of every column in row `yi`, least significant first."""
+        up = self.rows[yi - 1] if yi > 0 else 0
+        down = self.rows[yi + 1] if yi + 1 < len(self.rows) else 0
+        row = self.rows[yi]
+        planes = [0, 0, 0, 0]
+        for neighbors in (
+            up << 1, up, up >> 1,
+            row << 1, row >> 1,
+            down << 1, down, down >> 1,
+        ):
+            carry = neighbors & self.full
+            for bit in range(4):
+                if not carry:
+                    break
+                planes[bit], carry = planes[bit] ^ carry, planes[bit] & carry
+        return planes
+
+    def accessible(self, max_adjacent_rolls: int=4) -> list[int]:
+        """Per-row masks of the rolls with fewer than `max_adjacent_rolls` neighboring rolls."""
+        masks = []
+        for yi, row in enumerate(self.rows):
+            planes = self.adjacent_counts(yi)
+            fewer = 0
+            for count in range(min(max_adjacent_rolls, 9)):
+                equal = self.full
+                for bit, plane in enumerate(planes):
+                    equal &= plane if (count >> bit) & 1 else ~plane
+                fewer |= equal
+            masks.append(row & fewer)
+        return masks
+
+    def remove(self, masks: list[int]) -> "BitGrid":
+        return BitGrid([row & ~mask for row, mask in zip(self.rows, masks)], self.width)
+
+    def peel(self, max_adjacent_rolls: int=4) -> tuple[int, "BitGrid"]:
+        """Remove accessible rolls pass by pass until none are left. Returns the number removed and the final grid."""
+        grid, n_removed = self, 0
+        while any(masks := grid.accessible(max_adjacent_rolls)):
+            n_removed += sum(mask.bit_count() for mask in masks)
+            grid = grid.remove(masks)
+        return n_removed, grid
+
+
+def forklift_file(input_file: Path, output_file: Path, max_adjacent_rolls: int=4) -> int:
+    """Out-of-core Part 1: write the forklift grid of `input_file` to `output_file` row by row.
+
+    Rows are read from a memory map and only the previous, current and next rows
+    are kept, so memory is bounded by the row width. Returns the number of
+    accessible rolls.
+    """
+    n_accessible = 0
+    window = []
+    with open(output_file, "wb") as out:
+        for row in _iter_rows(input_file):
+            window.append(np.frombuffer(row, dtype=np.uint8) == ord("@"))
+            if len(window) == 2:
+                # First row: nothing above it
+                window.insert(0, np.zeros_like(window[0]))
+            if len(window) == 3:
+                n_accessible += _forklift_row(window, out, max_adjacent_rolls)
+                window.pop(0)
+        if window:
+            # Last row: nothing below it
+            window.append(np.zeros_like(window[-1]))
+            if len(window) == 2:
+                window.insert(0, np.zeros_like(window[0]))
+            n_accessible += _forklift_row(window, out, max_adjacent_rolls)
+    return n_accessible
+
+
+def _iter_rows(input_file: Path) -> Generator[bytes, None, None]:
+    """Yield the non-empty rows of a grid file from a memory map."""
+    if not Path(input_file).stat().st_size:
+        return
+    with open(input_file, "rb") as fid, mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < len(mm):
+            stop = mm.find(b"\n", start)
+            if stop == -1:
+                stop = len(mm)
+            row = mm[start:stop].rstrip(b"\r")
+            if row:
+                yield row
+            start = stop + 1
+
+
+def _forklift_row(window: list[np.ndarray], out, max_adjacent_rolls: int) -> int:
+    """Write the forklift output for the middle row of a 3-row window and count its accessible rolls."""
+    above, row, below = window
+    column_sums = np.pad(above.astype(np.uint8) + row + below, 1)
+    counts = column_sums[:-2] + column_sums[1:-1] + column_sums[2:] - row
+    accessible = row & (counts < max_adjacent_rolls)
+    line = np.where(accessible, ord("x"), np.where(row, ord("@"), ord("."))).astype(np.uint8)
+    out.write(line.tobytes() + b"\n")
+    return int(accessible.sum())
+
+
 # ------------------------------
 # Toy data test
 
@@ -109,6 +356,11 @@ want_grid = (
 )
 
 assert solution == want_grid.strip().splitlines()
+accessible, n_accessible = accessible_rolls(rolls)
+assert np.array_equal(accessible, np.array([[col == "x" for col in row] for row in solution]))
+assert n_accessible == 13
+bit_grid = BitGrid.from_lines(rolls)
+assert bit_grid.to_lines(bit_grid.accessible()) == solution
 
 
 # ------------------------------
@@ -119,6 +371,15 @@ part_1_solution = forklift(puzzle)
 
 forkliftable_count = count_rolls(part_1_solution, count_accessible=True)
 assert forkliftable_count == 1553
+assert accessible_rolls(puzzle)[1] == 1553
+assert sum(mask.bit_count() for mask in BitGrid.from_lines(puzzle).accessible()) == 1553
+
+# Streaming, one row at a time
+with TemporaryDirectory() as tmpdir:
+    output_file = Path(tmpdir) / "forklift.txt"
+    input_file = Path(__file__).parent / "assets" / "day_4_printing_department.txt"
+    assert forklift_file(input_file, output_file) == 1553
+    assert output_file.read_text().splitlines() == part_1_solution
 
 # ------------------------------
 # Part 2
@@ -145,6 +406,12 @@ while n_retries < 1:
     if rolls == prev:
         n_retries += 1
 
+toy_removed, _, toy_final = peel_rolls(rolls_orig_)
+assert toy_final == rolls
+assert toy_removed == count_rolls(rolls_orig_) - count_rolls(rolls)
+assert removable_rolls_by_threshold(core_numbers(rolls_orig_))[4] == toy_removed
+assert BitGrid.from_lines(rolls_orig_).peel()[1].to_lines() == toy_final
+
 
 # Part 2 input data
 rolls = get_input_data().strip().splitlines()
@@ -159,4 +426,10 @@ while check_for_accessible_rolls:
 
 n_rolls_final = count_rolls(rolls)
 removable_rolls = n_rolls_orig - n_rolls_final
-assert removable_rolls == 8442
\ No newline at end of file
+assert removable_rolls == 8442
+assert peel_rolls(get_input_data().strip().splitlines())[0] == 8442
+
+# Every threshold at once
+removable_by_threshold = removable_rolls_by_threshold(core_numbers(get_input_data().strip().splitlines()))
+assert removable_by_threshold[4] == 8442
+assert BitGrid.from_lines(get_input_data().strip().splitlines()).peel()[0] == 8442
\ No newline at end of file
@@ -1,5 +1,8 @@
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 
+import numpy as np
+
 
 def get_toy_data() -> str:
     return (
@@ -73,6 +76,127 @@ def inclusive_count(start, stop):
     return (stop - start) + 1
 
 
+class FreshIndex:
+    """Sorted, merged ID ranges that answer membership and counting queries by binary search."""
+
+    def __init__(self, id_ranges: list[tuple[int, int]]):
+        merged = remove_overlap(id_ranges)
+        self.starts = np.array([start for start, _ in merged], dtype=np.int64)
+        self.stops = np.array([stop for _, stop in merged], dtype=np.int64)
+        # Number of fresh IDs in all of the ranges before each range
+        sizes = [inclusive_count(start, stop) for start, stop in merged]
+        self.fresh_before = np.concatenate(([0], np.cumsum(sizes, dtype=np.int64)))
+
+    def contains(self, ids) -> np.ndarray:
+        """Boolean mask of the fresh IDs, for any number of IDs at once."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self.starts):
+            return np.zeros(ids.shape, dtype=bool)
+        candidate = np.searchsorted(self.starts, ids, side="right") - 1
+        return (candidate >= 0) & (ids <= self.stops[np.maximum(candidate, 0)])
+
+    def count_fresh(self, lower_bound: int, upper_bound: int) -> int:
+        """Number of fresh IDs in [lower_bound, upper_bound]."""
+        if lower_bound > upper_bound:
+            return 0
+        return self._fresh_up_to(upper_bound) - self._fresh_up_to(lower_bound - 1)
+
+    def _fresh_up_to(self, ingredient_id: int) -> int:
+        candidate = int(np.searchsorted(self.starts, ingredient_id, side="right")) - 1
+        if candidate < 0:
+            return 0
+        partial = min(ingredient_id, int(self.stops[candidate])) - int(self.starts[candidate]) + 1
+        return int(self.fresh_before[candidate]) + partial
+
+
+class FreshRangeSet:
+    """Mutable set of fresh ID ranges that keeps the total number of fresh IDs up to date.
+
+    Ranges are kept merged (overlapping or touching ranges become one) in two sorted
+    lists of starts and stops. Updates find the affected ranges by binary search and
+    only adjust the total by the ranges they replace.
+    """
+
+    def __init__(self, id_ranges: list[tuple[int, int]]=()):
+        self.starts: list[int] = []
+        self.stops: list[int] = []
+        self.n_fresh = 0
+        for start, stop in id_ranges:
+            self.add_range(start, stop)
+
+    def add_range(self, start: int, stop: int) -> None:
+        """Mark every ID in [start, stop] as fresh."""
+        # Ranges that overlap or touch [start, stop]
+        first = bisect_left(self.stops, start - 1)
+        last = bisect_right(self.starts, stop + 1)
+        if first < last:
+            start = min(start, self.starts[first])
+            stop = max(stop, self.stops[last - 1])
+        self._replace(first, last, [(start, stop)])
+
+    def remove_range(self, start: int, stop: int) -> None:
+        """Mark every ID in [start, stop] as not fresh."""
+        # Ranges that overlap [start, stop]
+        first = bisect_left(self.stops, start)
+        last = bisect_right(self.starts, stop)
+        if first >= last:
+            return
+        remaining = []
+        if self.starts[first] < start:
+            remaining.append((self.starts[first], start - 1))
+        if self.stops[last - 1] > stop:
+            remaining.append((stop + 1, self.stops[last - 1]))
+        self._replace(first, last, remaining)
+
+    def _replace(self, first: int, last: int, id_ranges: list[tuple[int, int]]) -> None:
+        removed = sum(map(inclusive_count, self.starts[first:last], self.stops[first:last]))
+        self.n_fresh += sum(inclusive_count(start, stop) for start, stop in id_ranges) - removed
+        self.starts[first:last] = [start for start, _ in id_ranges]
+        self.stops[first:last] = [stop for _, stop in id_ranges]
+
+    def __contains__(self, ingredient_id: int) -> bool:
+        candidate = bisect_right(self.starts, ingredient_id) - 1
+        return candidate >= 0 and ingredient_id <= self.stops[candidate]
+
+    @property
+    def id_ranges(self) -> list[tuple[int, int]]:
+        return list(zip(self.starts, self.stops))
+
+
+def count_fresh_streaming(fpath: Path, chunk_bytes: int=1 << 22) -> tuple[int, int]:
+    """Part 1 without loading the database: count fresh IDs while streaming the ID section.
+
+    The range header is parsed line by line into a FreshIndex. The available IDs are
+    then read in newline-aligned chunks, parsed in bulk with NumPy and tested against
+    the merged ranges, so memory stays constant however many IDs there are.
+
+    Returns the number of fresh IDs and the number of available IDs.
+    """
+    n_fresh = n_ids = 0
+    with open(fpath, "rb") as fid:
+        id_ranges = []
+        for line in fid:
+            if not line.strip():
+                break
+            id_ranges.append(tuple(int(part) for part in line.split(b"-")))
+        index = FreshIndex(sorted(id_ranges))
+
+        remainder = b""
+        while True:
+            data = fid.read(chunk_bytes)
+            chunk = remainder + data
+            if data:
+                cut = chunk.rfind(b"\n") + 1
+                chunk, remainder = chunk[:cut], chunk[cut:]
+            if chunk.strip():
+                ids = np.fromstring(chunk.decode(), dtype=np.int64, sep=" ")
+                n_fresh += int(index.contains(ids).sum())
+                n_ids += len(ids)
+            if not data:
+                break
+    return n_fresh, n_ids
+
+
 def test_part_1():
     """Test our solution on the AoC toy data"""
     db = get_toy_data()
@@ -81,12 +205,23 @@ def test_part_1():
     assert n_fresh == 3
     assert fresh == [5, 11, 17]
 
+    id_ranges, available_ids = parse_database(db)
+    index = FreshIndex(id_ranges)
+    assert np.asarray(available_ids)[index.contains(available_ids)].tolist() == fresh
+    assert index.count_fresh(1, 11) == 5
+    assert index.count_fresh(14, 11) == 0
+    assert not FreshIndex([]).contains(available_ids).any()
+
 
 def solve_part_1():
     """Get the available IDs that are contained within one of the ID ranges."""
     db = get_input_data()
     fresh_ids = get_fresh_ids(db)
     assert len(fresh_ids) == 613
+    id_ranges, available_ids = parse_database(db)
+    assert FreshIndex(id_ranges).contains(available_ids).sum() == 613
+    input_path = Path(__file__).parent / "assets" / "day_5_cafeteria.txt"
+    assert count_fresh_streaming(input_path, chunk_bytes=1024) == (613, len(available_ids))
     return len(fresh_ids)
     
 
@@ -97,12 +232,22 @@ def test_part_2():
     n_fresh_ids = sum(inclusive_count(start, stop) for (start, stop) in id_ranges)
     assert n_fresh_ids == 14
 
+    range_set = FreshRangeSet(id_ranges)
+    assert range_set.n_fresh == 14
+    range_set.remove_range(12, 15)
+    assert range_set.n_fresh == 10
+    assert range_set.id_ranges == [(3, 5), (10, 11), (16, 20)]
+    range_set.add_range(6, 9)
+    assert range_set.id_ranges == [(3, 11), (16, 20)]
+
 
 def solve_part_2():
     """Get the number of possible Fresh ingredient IDs, given the Fresh ID ranges."""
     db = get_input_data()
     id_ranges, _ = parse_database(db, unique_id_ranges=True)
     n_fresh_ids = sum(inclusive_count(start, stop) for (start, stop) in id_ranges)
+    assert FreshIndex(id_ranges).count_fresh(0, id_ranges[-1][1]) == n_fresh_ids
+    assert FreshRangeSet(id_ranges).n_fresh == n_fresh_ids
     return n_fresh_ids
 
 
@@ -1,6 +1,14 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from itertools import groupby
+from functools import partial
 from math import prod
+from time import perf_counter
+
+import numpy as np
+
+# Largest magnitude that is safe to accumulate in an int64
+INT64_LIMIT = 2**62
 
 def get_toy_data():
     return (
@@ -22,13 +30,12 @@ def test_part_1():
     expressions = build_expressions(puzzle)
     answer = sum(evaluate(expressions))
     assert answer == 4277556
+    assert reduce_columns(*parse_worksheet(get_toy_data())) == list(evaluate(expressions))
     return answer
 
 
 def solve_part_1():
-    puzzle = prep_data(get_input_data())
-    expressions = build_expressions(puzzle)
-    return sum(evaluate(expressions))
+    return sum(reduce_columns(*parse_worksheet(get_input_data())))
 
 def prep_data(puzzle):
     return [row.strip().split() for row in puzzle.splitlines()]
@@ -57,6 +64,144 @@ def evaluate(expressions):
     return (eval(expression) for expression in expressions)
 
 
+def parse_worksheet(puzzle: str) -> tuple[np.ndarray, np.ndarray]:
+    """Parse a Part 1 worksheet into a (rows, problems) array of operands and an array of operators.
+
+    The operands are int64 when they fit, and Python ints (object dtype) otherwise.
+    """
+    *number_rows, operator_row = puzzle.splitlines()
+    operators = np.array(operator_row.split())
+    text = " ".join(number_rows)
+    numbers = np.fromstring(text, dtype=np.int64, sep=" ")
+    # Out of range operands are clamped to the int64 limits while parsing
+    int64 = np.iinfo(np.int64)
+    if np.any((numbers == int64.max) | (numbers == int64.min)):
+        numbers = np.array([int(number) for number in text.split()], dtype=object)
+    return numbers.reshape(len(number_rows), len(operators)), operators
+
+
+def reduce_columns(numbers: np.ndarray, operators: np.ndarray) -> list[int]:
+    """Part 1 without eval: sum or multiply every column of operands, see parse_worksheet.
+
+    Columns whose result is guaranteed to fit in an int64 are reduced with NumPy,
+    the rest fall back to Python ints.
+    """
+    results = np.zeros(len(operators), dtype=object)
+    is_sum = operators == "+"
+    if numbers.dtype == np.int64:
+        magnitudes = np.abs(numbers).astype(np.float64)
+        fits = np.where(
+            is_sum,
+            magnitudes.sum(axis=0) < INT64_LIMIT,
+            np.log2(np.maximum(magnitudes, 1)).sum(axis=0) < np.log2(INT64_LIMIT),
+        )
+        fast_sum, fast_prod = fits & is_sum, fits & ~is_sum
+        results[fast_sum] = numbers[:, fast_sum].sum(axis=0).tolist()
+        results[fast_prod] = numbers[:, fast_prod].prod(axis=0).tolist()
+    else:
+        fits = np.zeros(len(operators), dtype=bool)
+    for column in np.flatnonzero(~fits):
+        operands = [int(number) for number in numbers[:, column]]
+        results[column] = sum(operands) if is_sum[column] else prod(operands)
+    return results.tolist()
+
+
+def parse_columns_part_2(puzzle: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse a Part 2 worksheet without transposing it in Python.
+
+    The digit rows become a 2D uint8 character matrix. All-space columns separate
+    the problems, and the number in every other column is the dot product of its
+    digits with powers of ten given by the number of digits below each one.
+
+    Returns the vertical numbers in column order, the index in that array where each
+    problem starts, and the operator of each problem.
+    """
+    *digit_rows, operator_row = puzzle.splitlines()
+    width = max(map(len, digit_rows))
+    chars = np.frombuffer(
+        "".join(row.ljust(width) for row in digit_rows).encode(), dtype=np.uint8
+    ).reshape(len(digit_rows), width)
+
+    is_digit = chars != ord(" ")
+    is_number = is_digit.any(axis=0)
+    digits = np.where(is_digit, chars - ord("0"), 0).astype(np.int64)
+    # Number of digits below each cell in its column
+    places = np.cumsum(is_digit[::-1], axis=0)[::-1] - is_digit
+    if len(digit_rows) < 19:
+        numbers = (digits * 10 ** places).sum(axis=0)
+    else:
+        numbers = (digits.astype(object) * 10 ** places.astype(object)).sum(axis=0)
+
+    # A problem starts at every number column that follows a separator column
+    follows_separator = np.concatenate(([True], ~is_number[:-1]))
+    starts = np.flatnonzero(is_number & follows_separator)
+    numbers = numbers[is_number]
+    starts = np.searchsorted(np.flatnonzero(is_number), starts)
+    return numbers, starts, np.array(operator_row.split())
+
+
+def reduce_groups(numbers: np.ndarray, starts: np.ndarray, operators: np.ndarray) -> list[int]:
+    """Part 2 results from parse_columns_part_2: reduce each problem with its operator."""
+    stops = np.append(starts[1:], len(numbers))
+    results = []
+    for start, stop, op in zip(starts.tolist(), stops.tolist(), operators.tolist()):
+        operands = numbers[start:stop].tolist()
+        results.append(sum(operands) if op == "+" else prod(operands))
+    return results
+
+
+def product_tree(operands: list[int]) -> int:
+    """Multiply big ints pairwise in a balanced tree instead of left to right.
+
+    Both factors of every multiplication then have similar sizes, which keeps
+    Python's subquadratic (Karatsuba) multiplication busy instead of repeatedly
+    multiplying a huge partial product by a small operand.
+    """
+    operands = list(operands)
+    if not operands:
+        return 1
+    while len(operands) > 1:
+        paired = [a * b for a, b in zip(operands[::2], operands[1::2])]
+        if len(operands) % 2:
+            paired.append(operands[-1])
+        operands = paired
+    return operands[0]
+
+
+def reduce_problems(
+        operands: list[list[int]],
+        operators: list[str],
+        max_workers: int | None=None,
+        tree_threshold: int=32,
+    ) -> tuple[list[int], list[float]]:
+    """Reduce every problem, returning the results and the seconds spent on each problem.
+
+    Products of at least `tree_threshold` operands use product_tree. With
+    `max_workers`, problems are spread over a process pool.
+    """
+    reduce = partial(_reduce_problem, tree_threshold=tree_threshold)
+    if max_workers is None:
+        timed = list(map(reduce, operands, operators))
+    else:
+        chunksize = max(1, len(operands) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            timed = list(executor.map(reduce, operands, operators, chunksize=chunksize))
+    results = [result for result, _ in timed]
+    seconds = [elapsed for _, elapsed in timed]
+    return results, seconds
+
+
+def _reduce_problem(operands: list[int], operator: str, tree_threshold: int=32) -> tuple[int, float]:
+    tic = perf_counter()
+    if operator == "+":
+        result = sum(operands)
+    elif len(operands) >= tree_threshold:
+        result = product_tree(operands)
+    else:
+        result = prod(operands)
+    return result, perf_counter() - tic
+
+
 def parse_input_part_2(s: str):
     """Rodrigos Solution."""
     def is_not_none(obj):
@@ -90,6 +235,25 @@ def test_part_2():
     s = get_toy_data()
     results = sum(part_2(s))
     assert results == 3263827
+    assert reduce_groups(*parse_columns_part_2(s)) == part_2(s) == parse_input_part_2(s)
+
+    results, seconds = solve_part_2(s, tree_threshold=2)
+    assert results == part_2(s)
+    assert sorted(index for index, _ in slowest_problems(seconds, n=10)) == [0, 1, 2, 3]
+
+
+def solve_part_2(puzzle: str, max_workers: int | None=None, tree_threshold: int=32):
+    """Part 2 through the char-matrix parser and reduce_problems, with the time spent on each problem."""
+    numbers, starts, operators = parse_columns_part_2(puzzle)
+    operands = [group.tolist() for group in np.split(numbers, starts[1:])]
+    return reduce_problems(
+        operands, operators.tolist(), max_workers=max_workers, tree_threshold=tree_threshold
+    )
+
+
+def slowest_problems(seconds: list[float], n: int=5) -> list[tuple[int, float]]:
+    """The `n` most expensive problems from reduce_problems, as (problem index, seconds)."""
+    return sorted(enumerate(seconds), key=lambda item: item[1], reverse=True)[:n]
 
 
 def part_2(puzzle: str):
@@ -134,4 +298,9 @@ if __name__ == "__main__":
     # My Solution
     test_part_2()
     my_solution = sum(part_2(get_input_data())) 
-    assert my_solution == 7669802156452
\ No newline at end of file
+    assert my_solution == 7669802156452
+    # Balanced product trees, with the most expensive problems reported
+    results, seconds = solve_part_2(get_input_data())
+    assert sum(results) == 7669802156452
+    for index, elapsed in slowest_problems(seconds):
+        print(f"Problem {index} took {elapsed * 1e6:.1f} us")
\ No newline at end of file
@@ -1,5 +1,17 @@
+import argparse
 from functools import cache
+import hashlib
+import json
+import os
 from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from typing import BinaryIO
+
+import numpy as np
+
+# Above this, three timeline counts no longer add up within a uint64
+UINT64_SAFE = np.iinfo(np.uint64).max // 3
 
 def get_toy_data():
     return (
@@ -98,12 +110,222 @@ def count_paths(grid):
         return n_paths
     return dfs(start_row, start_col)
 
+def sweep(puzzle: str) -> tuple[int, int]:
+    """Part 1 and Part 2 in one top-down pass, without recursion.
+
+    Carries the number of timelines (paths) that reach every column of the current
+    row. A splitter hit by any timeline counts as one split, and passes its
+    timelines on to the columns either side of it.
+    """
+    rows = puzzle.splitlines()
+    timelines = [0] * len(rows[0])
+    timelines[rows[0].index("S")] = 1
+    n_splits = 0
+    for row in rows[1:]:
+        next_timelines = [0] * len(row)
+        for idx, n_timelines in enumerate(timelines):
+            if not n_timelines:
+                continue
+            if row[idx] == "^":
+                n_splits += 1
+                if idx > 0:
+                    next_timelines[idx - 1] += n_timelines
+                if idx + 1 < len(row):
+                    next_timelines[idx + 1] += n_timelines
+            else:
+                next_timelines[idx] += n_timelines
+        timelines = next_timelines
+    return n_splits, sum(timelines)
+
+
+def propagate_beams(puzzle: str) -> tuple[int, int]:
+    """Vectorized sweep for manifolds with any number of sources ("S"), in any row.
+
+    Each row is a vector of timeline counts. Splitter rows move the counts that hit
+    a splitter one column left and right with shifted adds, and every source adds a
+    new timeline in its column. Counts are uint64 until a row could overflow, then
+    Python ints (object dtype).
+    """
+    rows = puzzle.splitlines()
+    cells = np.frombuffer("".join(rows).encode(), dtype=np.uint8).reshape(len(rows), -1)
+    timelines = np.zeros(cells.shape[1], dtype=np.uint64)
+    n_splits = 0
+    for row in cells:
+        timelines, row_splits = propagate_row(timelines, row)
+        n_splits += row_splits
+    return n_splits, sum(timelines.tolist())
+
+
+def propagate_row(timelines: np.ndarray, row: np.ndarray) -> tuple[np.ndarray, int]:
+    """Move the timeline counts through one row of characters. Returns the new counts and the splits."""
+    n_splits = 0
+    splitters = row == ord("^")
+    if splitters.any():
+        hit = np.where(splitters, timelines, 0).astype(timelines.dtype)
+        n_splits = int(np.count_nonzero(hit))
+        if timelines.dtype == np.uint64 and timelines.max() > UINT64_SAFE:
+            timelines, hit = timelines.astype(object), hit.astype(object)
+        timelines = np.where(splitters, 0, timelines).astype(timelines.dtype)
+        timelines[:-1] += hit[1:]
+        timelines[1:] += hit[:-1]
+    timelines += (row == ord("S")).astype(timelines.dtype)
+    return timelines, n_splits
+
+
+def stream_manifold(
+        fid: BinaryIO,
+        checkpoint: Path | None=None,
+        checkpoint_every: int=100_000,
+        max_rows: int | None=None,
+    ) -> tuple[int, int]:
+    """Part 1 and Part 2 for a manifold read one row at a time from a binary stream.
+
+    Only the timeline count vector is kept, so memory is O(width). With a
+    `checkpoint` path, the vector and the position in the stream are saved every
+    `checkpoint_every` rows, and when `max_rows` stops the run early. An existing
+    checkpoint is resumed from, by seeking in files and by skipping rows otherwise.
+    The checkpoint is deleted once the stream has been read to the end.
+
+    A checkpoint is only resumed on the input that wrote it: the same file path,
+    size and modification time, or for pipes the same bytes up to the checkpoint,
+    and the same row width. Anything else raises a ValueError.
+    """
+    source = describe_source(fid)
+    # Pipes can't be compared by path, so they are compared by content instead
+    digest = None if fid.seekable() else hashlib.blake2b()
+    offset = n_rows = n_splits = 0
+    timelines = None
+    if checkpoint is not None and Path(checkpoint).exists():
+        state = load_checkpoint(checkpoint)
+        if state["source"] != source:
+            raise ValueError(f"Checkpoint {checkpoint} was written for a different input.")
+        offset, n_rows, n_splits, timelines = (
+            state["offset"], state["n_rows"], state["n_splits"], state["timelines"]
+        )
+        if digest is None:
+            fid.seek(offset)
+        else:
+            for _ in range(n_rows):
+                digest.update(fid.readline())
+            if digest.hexdigest() != state["digest"]:
+                raise ValueError(f"Checkpoint {checkpoint} was written for a different input.")
+
+    stopped = False
+    for line in iter(fid.readline, b""):
+        offset += len(line)
+        n_rows += 1
+        if digest is not None:
+            digest.update(line)
+        row = np.frombuffer(line.rstrip(b"\r\n"), dtype=np.uint8)
+        if len(row):
+            if timelines is None:
+                timelines = np.zeros(len(row), dtype=np.uint64)
+            elif len(row) != len(timelines):
+                raise ValueError(f"Row {n_rows} has width {len(row)}, expected {len(timelines)}.")
+            timelines, row_splits = propagate_row(timelines, row)
+            n_splits += row_splits
+        stopped = max_rows is not None and n_rows >= max_rows
+        if checkpoint is not None and (stopped or n_rows % checkpoint_every == 0):
+            save_checkpoint(
+                checkpoint,
+                {
+                    "source": source,
+                    "digest": None if digest is None else digest.hexdigest(),
+                    "offset": offset,
+                    "n_rows": n_rows,
+                    "n_splits": n_splits,
+                    "timelines": timelines,
+                },
+            )
+        if stopped:
+            break
+
+    if checkpoint is not None and not stopped:
+        Path(checkpoint).unlink(missing_ok=True)
+    n_paths = 0 if timelines is None else sum(timelines.tolist())
+    return n_splits, n_paths
+
+
+def describe_source(fid: BinaryIO) -> dict | None:
+    """Path, size and modification time of a seekable stream, or None for pipes."""
+    if not fid.seekable():
+        return None
+    position = fid.tell()
+    size = fid.seek(0, os.SEEK_END)
+    fid.seek(position)
+    name = getattr(fid, "name", None)
+    try:
+        mtime_ns = os.fstat(fid.fileno()).st_mtime_ns
+    except (AttributeError, OSError):
+        mtime_ns = None
+    return {
+        "path": os.path.abspath(name) if isinstance(name, str) else None,
+        "size": size,
+        "mtime_ns": mtime_ns,
+    }
+
+
+def save_checkpoint(checkpoint: Path, state: dict) -> None:
+    """Atomically write the streaming state to a JSON checkpoint."""
+    timelines = state["timelines"]
+    state = {**state, "timelines": None if timelines is None else timelines.tolist()}
+    checkpoint = Path(checkpoint)
+    tmp_path = checkpoint.with_name(checkpoint.name + ".tmp")
+    tmp_path.write_text(json.dumps(state))
+    os.replace(tmp_path, checkpoint)
+
+
+def load_checkpoint(checkpoint: Path) -> dict:
+    """Read the state written by save_checkpoint."""
+    state = json.loads(Path(checkpoint).read_text())
+    timelines = state["timelines"]
+    if timelines is not None:
+        fits = max(timelines, default=0) <= UINT64_SAFE
+        state["timelines"] = np.array(timelines, dtype=np.uint64 if fits else object)
+    return state
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Count tachyon beam splits and timelines.")
+    parser.add_argument(
+        "--stream", type=Path, required=False, default=None,
+        help="Stream a manifold from this file (or '-' for stdin) instead of running the checks.",
+    )
+    parser.add_argument(
+        "--checkpoint", type=Path, required=False, default=None, help="Checkpoint file to save to and resume from."
+    )
+    args = parser.parse_args()
+    if args.stream is not None:
+        if str(args.stream) == "-":
+            fid = sys.stdin.buffer
+        else:
+            fid = args.stream.expanduser().resolve().open("rb")
+        with fid:
+            n_splits, n_paths = stream_manifold(fid, checkpoint=args.checkpoint)
+        print(f"The beam was split {n_splits} times, into {n_paths} timelines.")
+        sys.exit()
+
     # Part 1
     _, grid = test_part_1()
     # Part 2
     n_paths = count_paths(grid)
     assert n_paths == 40
+    assert sweep(get_toy_data()) == (21, 40)
+    assert propagate_beams(get_toy_data()) == (21, 40)
+    with TemporaryDirectory() as tmpdir:
+        manifold = Path(tmpdir) / "manifold.txt"
+        manifold.write_text(get_toy_data())
+        checkpoint = Path(tmpdir) / "checkpoint.json"
+        with manifold.open("rb") as fid:
+            assert stream_manifold(fid, checkpoint=checkpoint, checkpoint_every=5) == (21, 40)
+        assert not checkpoint.exists()
+        # Stop partway, then resume from the checkpoint
+        with manifold.open("rb") as fid:
+            stream_manifold(fid, checkpoint=checkpoint, checkpoint_every=5, max_rows=7)
+        assert checkpoint.exists()
+        with manifold.open("rb") as fid:
+            assert stream_manifold(fid, checkpoint=checkpoint) == (21, 40)
+        assert not checkpoint.exists()
 
     # Real
     # Part 1
@@ -111,5 +333,7 @@ if __name__ == "__main__":
     assert n_splits == 1550
     n_paths = count_paths(grid)
     assert n_paths == 9897897326778
+    assert sweep(get_input_data()) == (1550, 9897897326778)
+    assert propagate_beams(get_input_data()) == (1550, 9897897326778)
 
 